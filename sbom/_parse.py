@@ -0,0 +1,46 @@
+"""Tokenizer for requirements.txt lines.
+
+Kept in its own module, fully type-annotated and free of project imports,
+so it can be compiled with mypyc or Cython as a drop-in replacement
+(imported as sbom._parse_c) without touching the scanner. The project
+currently ships no build step, so the pure-Python version is what runs
+unless a compiled module is provided.
+"""
+import re
+
+# Matches "name" or "name<operator><version>", e.g. "flask" or "requests==3.23.1",
+# where the name may carry an extras group as in "requests[security]==2.1.0".
+# The name class cannot cross whitespace or operator characters and the
+# operator is a single character class, so the engine never backtracks.
+_REQUIREMENT_RE = re.compile(r"^(?P<name>[A-Za-z0-9_.\-]+(?:\[[^\]]*\])?)\s*(?P<spec>[<>=~!]=?.*)?$", re.ASCII)
+
+# Characters that can start a version spec; checked before running the regex.
+_OPERATOR_CHARS = frozenset("<>=~!")
+
+
+def parse_requirements_line(line: str) -> tuple[str, str | None] | None:
+    """Tokenize one requirements.txt line into a (name, version) pair.
+
+    Args:
+        line (str): A raw line from a requirements.txt file.
+
+    Returns:
+        tuple[str, str | None] | None: The dependency name and version spec
+        (None if no version is specified), or None for blank lines and
+        comments.
+    """
+    line = line.partition("#")[0].strip()
+    if not line:
+        return None
+
+    if _OPERATOR_CHARS.isdisjoint(line):
+        # A bare name like "numpy": the C-level disjointness scan
+        # is far cheaper than running the regex to find nothing.
+        return line, None
+
+    match = _REQUIREMENT_RE.match(line)
+    if match:
+        return match.group("name"), match.group("spec") # for example ("flask", ">=1.2")
+
+    # An exotic requirement the pattern does not understand.
+    return line, None
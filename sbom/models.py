@@ -2,11 +2,18 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
-@dataclass(frozen=True) # immutable
+@dataclass(frozen=True, slots=True) # immutable; slots avoid a per-instance __dict__
 class DependencyRecord:
     name: str
     version: str | None # None if no version is specified
     type: Literal["pip", "npm"]
     path: Path
     dev: bool = False # Default: not a dev dependency
-    git_commit: str | None = None
\ No newline at end of file
+    git_commit: str | None = None
+
+    def __hash__(self) -> int:
+        # Hash only the fields that discriminate between dependencies.
+        # path and git_commit are shared by every record from the same file,
+        # so including them would just build a bigger tuple per set operation.
+        # Equality still compares all fields (generated __eq__).
+        return hash((self.name, self.version, self.type, self.dev))
\ No newline at end of file
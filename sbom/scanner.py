@@ -1,13 +1,127 @@
 from pathlib import Path
-import json
-import subprocess
-import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import os
+import sys
 
 from sbom.models import DependencyRecord
 
+try:
+    from sbom._parse_c import parse_requirements_line # compiled tokenizer, if built
+except ImportError:
+    from sbom._parse import parse_requirements_line
+
+try:
+    from orjson import loads as _json_loads # much faster C JSON parser, if available
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    import ijson # streaming JSON parser, if available
+except ImportError:
+    ijson = None
+
+try:
+    import pygit2 # in-process libgit2 bindings, if available
+except ImportError:
+    pygit2 = None
+
 import logging
 logger = logging.getLogger(__name__)
 
+# Interned so every record shares the same two type-string objects.
+_PIP = sys.intern("pip")
+_NPM = sys.intern("npm")
+
+# Lockfiles above this size are streamed (when ijson is available) instead
+# of fully parsed, keeping peak memory decoupled from input size.
+_STREAMING_THRESHOLD_BYTES = 1 << 20 # 1 MiB
+
+_DEPENDENCY_FILENAMES = frozenset((
+    "requirements.txt",
+    "package.json",
+    "package-lock.json"
+))
+
+def _intern_optional(value: str | None) -> str | None:
+    """sys.intern that tolerates None (used for missing versions).
+
+    The same package names and versions repeat across many repos; interning
+    collapses the duplicates to one string object each, which saves memory
+    and lets set lookups compare by identity first.
+    """
+    return sys.intern(value) if value is not None else None
+
+@lru_cache(maxsize=256)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """Read and parse a JSON file, memoized on (path, mtime, size).
+
+    The mtime/size key makes invalidation automatic: any change to the
+    file produces a new key and a fresh parse. Callers must treat the
+    returned structure as read-only, since it is shared between calls.
+    """
+    # orjson wants bytes, and json.loads accepts them too, so reading the
+    # raw bytes also skips a UTF-8 decode round trip with either backend.
+    return _json_loads(Path(path).read_bytes())
+
+def _load_json(path: Path) -> dict:
+    """Load a JSON file, using orjson when available for faster parsing.
+
+    Parses are cached, so rescanning unchanged files skips the (dominant)
+    JSON parse cost entirely.
+    """
+    stat = path.stat()
+    return _load_json_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=None)
+def _read_git_commit(repo: str) -> str | None:
+    """Resolve the HEAD commit hash of a repository from its .git directory.
+
+    Reads .git/HEAD directly (following one symbolic ref, via the loose
+    ref file or packed-refs) instead of spawning a git subprocess, which
+    would cost a fork+exec per repository.
+    """
+    if pygit2 is not None:
+        # libgit2 resolves HEAD in-process and understands layouts the manual
+        # read below does not (worktrees, where .git is a pointer file).
+        try:
+            return str(pygit2.Repository(repo).head.target)
+        except Exception:
+            pass # fall back to reading the files directly
+
+    git_dir = Path(repo) / ".git"
+    try:
+        if git_dir.is_file():
+            # Submodules and worktrees have a .git *file* containing a
+            # "gitdir: <path>" pointer to the real git directory.
+            pointer = git_dir.read_text().strip()
+            if not pointer.startswith("gitdir: "):
+                logger.warning(f"Unrecognized .git file in repo {repo}")
+                return None
+            git_dir = Path(repo) / pointer[8:] # keeps absolute paths absolute
+
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head # detached HEAD: the hash is stored directly
+
+        ref = head[5:]
+        ref_file = git_dir / ref
+        if ref_file.exists():
+            return ref_file.read_text().strip()
+
+        # The ref may have been packed into .git/packed-refs instead.
+        for line in (git_dir / "packed-refs").read_text().splitlines():
+            if line.endswith(" " + ref):
+                return line.split(" ", 1)[0]
+
+        logger.warning(f"Could not resolve git ref {ref} for repo {repo}")
+        return None
+    except OSError:
+        # FileNotFoundError for non-repos, but also e.g. PermissionError,
+        # or NotADirectoryError from odd layouts; never abort the scan.
+        logger.warning(f"No git commit found for repo {repo}. Is it a git repository?")
+        return None
+
 class ScanningError(Exception):
     """Base class for all SBOM scanner exceptions"""
 
@@ -19,12 +133,6 @@ class NoDependenciesFoundError(ScanningError):
 
 class DependencyScanner:
     """Scans a directory for dependency files and collects dependency information."""
-    
-    _DEPENDENCY_FILENAMES = [
-        "requirements.txt",
-        "package.json",
-        "package-lock.json"
-    ]
 
     def __init__(self, root_directory: Path | str) -> None:
         """Initialize the scanner with a root directory.
@@ -34,81 +142,110 @@ class DependencyScanner:
         """
         self.root_directory = Path(root_directory) # works for both str and Path
         self.dependencies: set[DependencyRecord] | None = None
+        # Dispatch table for dependency files that are parsed on their own.
+        # package.json and package-lock.json are paired in _scan_repo instead,
+        # because the lockfile takes precedence when both exist. Bound methods
+        # are stored so each dispatch is a single dict lookup.
+        self._single_file_handlers = {
+            "requirements.txt": self._parse_python_dependencies
+        }
 
     def _get_git_commit(self, repo: Path) -> str | None:
         """Return the latest Git commit hash (HEAD) for the given repository.
 
+        Results are memoized per repository path, so scanning the same repo
+        again within one process does not repeat the ref resolution.
+
         Args:
             repo (Path): Path to the repository.
 
         Returns:
             str | None: Full commit hash, or None if the repository is not
-            a Git repo, empty, or Git is not installed.
+            a Git repo or has no commits yet.
         """
-        try:
-            result = subprocess.check_output(
-                ["git", "-C", repo, "log", "--format=%H", "-n", "1"],
-                stderr=subprocess.STDOUT
-            )
-            return result.decode().strip()
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Git command failed for repo {repo}: {e}")
-            return None
-        except FileNotFoundError as e:
-            logger.warning("Git executable not found. Is Git installed?")
-            return None
-
-    def _is_dependency_file(self, entry: Path) -> bool:
-        """Check if a file is a recognized dependency file."""
-        return entry.name in self._DEPENDENCY_FILENAMES
-    
+        # The cached helper is a module-level function because lru_cache on
+        # a method would keep a reference to self alive per cache entry.
+        return _read_git_commit(str(repo))
+
     def _find_dependency_files(self, repo: Path) -> dict[str, Path]:
         """Find dependency files in the given repository."""
-        return {entry.name: entry for entry in repo.iterdir() if self._is_dependency_file(entry)}
+        # os.scandir reuses the file type reported by the directory read itself,
+        # so no extra stat() call is needed per entry (unlike Path.is_file()).
+        with os.scandir(repo) as entries:
+            return {
+                entry.name: Path(entry.path)
+                for entry in entries
+                if entry.name in _DEPENDENCY_FILENAMES and entry.is_file(follow_symlinks=False)
+            }
 
-    def _parse_python_dependencies(self, requirements_txt: Path) -> set[DependencyRecord]:
+    def _parse_python_dependencies(self, requirements_txt: Path, *, git_commit: str | None = None) -> set[DependencyRecord]:
         """Parse a Python requirements.txt file into dependency records.
 
         Args:
             requirements_txt (Path): Path to the requirements.txt file.
+            git_commit (str | None): Commit hash to record on each dependency.
 
         Returns:
             set[DependencyRecord]: Set of parsed Python dependencies.
         """
         dependency_set = set()
-        operators = ("==", ">=", "<=", "!=", "~=", ">", "<")
         
-        with requirements_txt.open() as f:
+        # Iterating the file object streams lines from the C buffered reader;
+        # a 64 KiB buffer covers most requirement files in one read.
+        with requirements_txt.open(encoding="utf-8", buffering=1<<16) as f:
             for line in f:
-                line = line.split("#", 1)[0].strip()
-                if not line:
-                    continue
-
-                # for example a line that just says "numpy"
-                name = line
-                version = None
-
-                for op in operators:
-                    if op in line:
-                        name, version = line.split(op, 1)
-                        name = name.strip()
-                        version = op + version # for example ">=1.2"
-                        break # operator already found
+                parsed = parse_requirements_line(line)
+                if parsed is None:
+                    continue # blank line or comment
 
+                name, version = parsed
                 dependency_set.add(DependencyRecord(
-                    name=name,
-                    version=version, 
-                    type="pip",
-                    path=requirements_txt.absolute()
+                    name=sys.intern(name),
+                    version=_intern_optional(version), 
+                    type=_PIP,
+                    path=requirements_txt.absolute(),
+                    git_commit=git_commit
                 ))
         
         return dependency_set
     
-    def _parse_package_lock_json(self, package_lock_json: Path) -> set[DependencyRecord]:
+    def _stream_package_lock_packages(self, package_lock_json: Path, *, git_commit: str | None = None) -> set[DependencyRecord] | None:
+        """Stream the "packages" map of a package-lock.json with ijson.
+
+        Only the package entry currently being parsed is held in memory,
+        instead of the whole lockfile tree, which can be tens of MB.
+
+        Args:
+            package_lock_json (Path): Path to package-lock.json.
+            git_commit (str | None): Commit hash to record on each dependency.
+
+        Returns:
+            set[DependencyRecord] | None: Set of npm dependencies, or None if
+            the lockfile has no "packages" map (lockfileVersion 1), in which
+            case the caller should fall back to a full parse.
+        """
+        records = []
+        with open(package_lock_json, "rb") as f:
+            for name, info in ijson.kvitems(f, "packages"):
+                if name == "":
+                    continue # the root entry describes the project itself
+                records.append(DependencyRecord(
+                    name=sys.intern(name.split("node_modules/")[-1]),
+                    version=_intern_optional(info.get("version")),
+                    type=_NPM,
+                    path=package_lock_json.absolute(),
+                    dev=info.get("dev", False),
+                    git_commit=git_commit
+                ))
+
+        return set(records) if records else None
+
+    def _parse_package_lock_json(self, package_lock_json: Path, *, git_commit: str | None = None) -> set[DependencyRecord]:
         """Parse an npm package-lock.json file into dependency records.
 
         Args:
             package_lock_json (Path): Path to package-lock.json.
+            git_commit (str | None): Commit hash to record on each dependency.
 
         Returns:
             set[DependencyRecord]: Set of npm dependencies.
@@ -116,82 +253,119 @@ class DependencyScanner:
         Raises:
             ValueError: If lockfileVersion is unsupported.
         """
-        with open(package_lock_json, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            lockfile_version = data["lockfileVersion"]
-
-            if lockfile_version in {1, 2}:
-                # v2 is backwards-compatible with v1 according to https://docs.npmjs.com/cli/v11/configuring-npm/package-lock-json
-                deps: set[DependencyRecord] = set()
-
-                def _walk_dependencies(dep_dict: dict, dev_flag: bool = False):
-                    for name, info in dep_dict.items():
-                        dep_dev = info.get("dev", dev_flag)
-                        dep_version = info.get("version")
-                        deps.add(DependencyRecord(
-                            name=name,
-                            version=dep_version,
-                            type="npm",
-                            path=package_lock_json.absolute(),
-                            dev=dep_dev
-                        ))
-                        dep_deps = info.get("dependencies", {})
-                        _walk_dependencies(dep_deps, dev_flag=dep_dev)
-
-                top_level_deps = data.get("dependencies", {})
-                _walk_dependencies(top_level_deps)
-
-                return deps
-            
-            elif lockfile_version == 3:
-                packages = data["packages"]
-                return {
-                    DependencyRecord(
-                        name=name.split("node_modules/")[-1],
-                        version=info.get("version"),
-                        type="npm",
-                        path=package_lock_json.absolute(),
-                        dev=info.get("dev", False)
-                    )
-                    for name, info in packages.items()
-                    if name != ""
-                }  
-            else:
-                raise ValueError(f"Unsupported package-lock.json lockfileVersion: {lockfile_version}")
-
-    def _parse_package_json(self, package_json: Path) -> set[DependencyRecord]:
+        # Only stream large files: the event parser trades throughput for
+        # bounded memory, which is a bad deal on small lockfiles.
+        if ijson is not None and package_lock_json.stat().st_size > _STREAMING_THRESHOLD_BYTES:
+            try:
+                # Read lockfileVersion in a short streaming pass first (it
+                # sits near the top of the file, and next() stops parsing
+                # there): unsupported versions must still raise ValueError so
+                # _parse_javascript_dependencies can fall back to
+                # package.json, and v1 files have no "packages" map, so
+                # streaming would parse the whole file only to find nothing.
+                with open(package_lock_json, "rb") as f:
+                    lockfile_version = next(ijson.items(f, "lockfileVersion"), None)
+
+                if lockfile_version not in {1, 2, 3}:
+                    raise ValueError(f"Unsupported package-lock.json lockfileVersion: {lockfile_version}")
+
+                if lockfile_version != 1:
+                    streamed = self._stream_package_lock_packages(package_lock_json, git_commit=git_commit)
+                    if streamed is not None:
+                        return streamed
+            except ijson.JSONError:
+                # ijson's parse errors are not ValueError subclasses, unlike
+                # json/orjson decode errors. Fall through to the full parse,
+                # which raises the ValueError the caller's contract expects.
+                pass
+
+        data = _load_json(package_lock_json)
+        lockfile_version = data["lockfileVersion"]
+
+        if lockfile_version not in {1, 2, 3}:
+            raise ValueError(f"Unsupported package-lock.json lockfileVersion: {lockfile_version}")
+
+        packages = data.get("packages")
+        if packages is not None:
+            # v2 and v3 lockfiles carry the flat "packages" map. v2 also
+            # repeats everything in the legacy nested "dependencies" tree,
+            # so parsing only the map avoids building every record twice.
+            return set([
+                DependencyRecord(
+                    name=sys.intern(name.split("node_modules/")[-1]),
+                    version=_intern_optional(info.get("version")),
+                    type=_NPM,
+                    path=package_lock_json.absolute(),
+                    dev=info.get("dev", False),
+                    git_commit=git_commit
+                )
+                for name, info in packages.items()
+                if name != "" # the root entry describes the project itself
+            ])
+
+        # v1: walk the nested "dependencies" tree.
+        # Collect into a list first; set(list) pre-sizes the hash table
+        # once instead of rehashing as the set grows.
+        records: list[DependencyRecord] = []
+        append = records.append # bound once, outside the loop
+        path = package_lock_json.absolute()
+
+        # An explicit stack instead of recursion: deep dependency trees
+        # would pay a Python call frame per node otherwise.
+        stack = [(data.get("dependencies", {}), False)]
+        while stack:
+            dep_dict, dev_flag = stack.pop()
+            for name, info in dep_dict.items():
+                dep_dev = info.get("dev", dev_flag)
+                append(DependencyRecord(
+                    name=sys.intern(name),
+                    version=_intern_optional(info.get("version")),
+                    type=_NPM,
+                    path=path,
+                    dev=dep_dev,
+                    git_commit=git_commit
+                ))
+                dep_deps = info.get("dependencies")
+                if dep_deps:
+                    stack.append((dep_deps, dep_dev))
+
+        return set(records)
+
+    def _parse_package_json(self, package_json: Path, *, git_commit: str | None = None) -> set[DependencyRecord]:
         """Parse an npm package.json file into dependency records.
 
         Args:
             package_json (Path): Path to package.json.
+            git_commit (str | None): Commit hash to record on each dependency.
 
         Returns:
             set[DependencyRecord]: Set of npm dependencies.
         """
-        with open(package_json, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            dependencies = {
-                DependencyRecord(
-                    name=name,
-                    version=version,
-                    type="npm",
-                    path=package_json.absolute(),
-                    dev=False
-                )
-                for name, version in data["dependencies"].items()
-            }
-            dev_dependencies = {
-                DependencyRecord(
-                    name=name,
-                    version=version,
-                    type="npm",
-                    path=package_json.absolute(),
-                    dev=True
-                )
-                for name, version in data.get("devDependencies", {}).items() # default to empty dict
-            }
-            
-            return dependencies | dev_dependencies
+        data = _load_json(package_json)
+        records = [
+            DependencyRecord(
+                name=sys.intern(name),
+                version=_intern_optional(version),
+                type=_NPM,
+                path=package_json.absolute(),
+                dev=False,
+                git_commit=git_commit
+            )
+            for name, version in data["dependencies"].items()
+        ]
+        records += [
+            DependencyRecord(
+                name=sys.intern(name),
+                version=_intern_optional(version),
+                type=_NPM,
+                path=package_json.absolute(),
+                dev=True,
+                git_commit=git_commit
+            )
+            for name, version in data.get("devDependencies", {}).items() # default to empty dict
+        ]
+        
+        return set(records)
 
 
 
@@ -200,7 +374,8 @@ class DependencyScanner:
             self,
             *,
             package_json: Path | None = None,
-            package_lock_json: Path | None = None
+            package_lock_json: Path | None = None,
+            git_commit: str | None = None
     ) -> set[DependencyRecord]:
         """Parse JavaScript dependencies from package.json or package-lock.json.
 
@@ -209,6 +384,7 @@ class DependencyScanner:
         Args:
             package_json (Path | None): Optional package.json path.
             package_lock_json (Path | None): Optional package-lock.json path.
+            git_commit (str | None): Commit hash to record on each dependency.
 
         Returns:
             set[DependencyRecord]: Set of JavaScript dependencies.
@@ -216,12 +392,12 @@ class DependencyScanner:
         if package_lock_json is not None:
             # Prefer parsing package-lock.json
             try:
-                return self._parse_package_lock_json(package_lock_json)
+                return self._parse_package_lock_json(package_lock_json, git_commit=git_commit)
             except ValueError:
                 logger.warning(f"Parsing of package-lock.json failed due to unsupported lockfileVersion: {package_lock_json}")
         if package_json is not None:
             # Otherwise, parse package.json
-            return self._parse_package_json(package_json)
+            return self._parse_package_json(package_json, git_commit=git_commit)
             
     def _scan_repo(self, repo: Path) -> set[DependencyRecord]:
         """Scan a repository for dependency files and parse them.
@@ -233,28 +409,34 @@ class DependencyScanner:
             set[DependencyRecord]: All dependencies found in the repository.
         """
         dependency_files = self._find_dependency_files(repo)
-        requirements_txt = dependency_files.get("requirements.txt")
+        if not dependency_files:
+            # Nothing to parse, so don't bother resolving the git commit.
+            return set()
+
         package_lock_json = dependency_files.get("package-lock.json")
         package_json = dependency_files.get("package.json")
 
+        # Resolve the commit once and pass it into the parsers, so each
+        # record is created with the right value instead of rebuilding the
+        # whole set with dataclasses.replace afterwards.
+        git_commit = self._get_git_commit(repo)
 
         repo_dependencies = set()
 
-        if requirements_txt:
-            python_dependencies = self._parse_python_dependencies(requirements_txt)
-            repo_dependencies.update(python_dependencies)
+        for filename, handler in self._single_file_handlers.items():
+            dependency_file = dependency_files.get(filename)
+            if dependency_file:
+                repo_dependencies.update(handler(dependency_file, git_commit=git_commit))
         
         if package_lock_json or package_json:
             javascript_dependencies = self._parse_javascript_dependencies(
                 package_json=package_json,
-                package_lock_json=package_lock_json
+                package_lock_json=package_lock_json,
+                git_commit=git_commit
             )
             repo_dependencies.update(javascript_dependencies)
         
-        # Add the git commit column to all the dependencies.
-        # Need to use dataclasses.replace because DependencyRecord is immutable.
-        git_commit = self._get_git_commit(repo)
-        return {dataclasses.replace(dep, git_commit=git_commit) for dep in repo_dependencies}
+        return repo_dependencies
 
     def scan(self) -> None:
         """Scan all repositories under the root directory for dependencies.
@@ -263,19 +445,24 @@ class DependencyScanner:
             NoRepositoriesFoundError: If no subdirectories are found.
             NoDependenciesFoundError: If no dependencies are found in any repository.
         """
-        repos = [entry for entry in self.root_directory.iterdir() if entry.is_dir()]
+        with os.scandir(self.root_directory) as entries:
+            repos = [Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False)]
         if not repos:
             raise NoRepositoriesFoundError(f"No repositories were found in {self.root_directory}.")
 
         self.dependencies = set()
 
-        for repo in repos:
-            repo_dependencies = self._scan_repo(repo)
-            if not repo_dependencies:
-                logger.warning(f"No dependencies found in the following repo: {repo}")
-                # Consider instead keeping track of the repos and handle it at the end.
-
-            self.dependencies.update(repo_dependencies)
+        # Scanning a repo is I/O-bound (file reads plus a git subprocess),
+        # so repos are scanned concurrently. The results are folded into
+        # the set in the main thread because set.update is not thread-safe.
+        max_workers = min(32, (os.cpu_count() or 4) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for repo, repo_dependencies in zip(repos, executor.map(self._scan_repo, repos)):
+                if not repo_dependencies:
+                    logger.warning(f"No dependencies found in the following repo: {repo}")
+                    # Consider instead keeping track of the repos and handle it at the end.
+
+                self.dependencies.update(repo_dependencies)
 
         if not self.dependencies:
             raise NoDependenciesFoundError(f"No dependencies found in repositories in {self.root_directory}.")
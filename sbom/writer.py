@@ -1,14 +1,36 @@
 from pathlib import Path
-from dataclasses import asdict, fields
+from dataclasses import fields
+from operator import attrgetter
 from typing import Iterable
 import csv
 import json
 
 from sbom.models import DependencyRecord
 
+try:
+    import orjson # much faster C JSON serializer, if available
+except ImportError:
+    orjson = None
+
 import logging
 logger = logging.getLogger(__name__)
 
+# Computed once; fields() introspects the dataclass on every call.
+_FIELDNAMES = tuple(f.name for f in fields(DependencyRecord))
+
+
+def _path_to_str(path: Path, cache: dict[Path, str]) -> str:
+    """Convert a Path to str through a cache.
+
+    Every dependency parsed from the same file shares one path value, so a
+    lockfile with thousands of entries would otherwise repeat the identical
+    conversion thousands of times.
+    """
+    path_str = cache.get(path)
+    if path_str is None:
+        path_str = cache[path] = str(path)
+    return path_str
+
 
 class SBOMWriter:
     """Writes a Software Bill of Materials (SBOM) in CSV and JSON formats."""
@@ -34,16 +56,32 @@ class SBOMWriter:
         return dir_path / filename
     
     @staticmethod
-    def _serialize_dependency(dep: DependencyRecord) -> dict:
-        """Convert a DependencyRecord to a dict suitable for CSV/JSON output."""
-        data = asdict(dep)
-        data["path"] = str(data["path"])  # normalize Path to string
-        return data
+    def _dependency_row(dep: DependencyRecord, path_cache: dict[Path, str]) -> tuple:
+        """Project a DependencyRecord to a plain tuple in _FIELDNAMES order.
+
+        One projection shared by the CSV and JSON writers; building dicts
+        here (as dataclasses.asdict would) is wasted work for the CSV path.
+
+        Args:
+            dep (DependencyRecord): The record to project.
+            path_cache (dict[Path, str]): Cache for Path conversions shared
+                across records.
+        """
+        return (
+            dep.name,
+            dep.version,
+            dep.type,
+            _path_to_str(dep.path, path_cache), # normalize Path to string
+            dep.dev,
+            dep.git_commit
+        )
 
     def write_csv(
             self,
             dependencies: Iterable[DependencyRecord],
-            output_dir: Path | None = None
+            output_dir: Path | None = None,
+            *,
+            presorted: bool = False
     ) -> None:
         """Write the given dependencies to a CSV file named 'sbom.csv'.
 
@@ -53,24 +91,29 @@ class SBOMWriter:
         Args:
             dependencies (Iterable[DependencyRecord]): Dependencies to write.
             output_dir (Path | None): Optional directory to override the default.
+            presorted (bool): Skip sorting if the caller already sorted by name.
         """
         filepath = self._resolve_filepath("sbom.csv", output_dir)
         logger.info(f"Writing CSV SBOM to {filepath.absolute()}")
 
-        fieldnames = [f.name for f in fields(DependencyRecord)]
-
-        with filepath.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        deps = dependencies if presorted else sorted(dependencies, key=attrgetter("name"))
 
-            for dep in sorted(dependencies, key=lambda d: d.name):
-                row = self._serialize_dependency(dep)
-                writer.writerow(row)
+        # The 1 MiB buffer batches the writerows output into few syscalls.
+        with filepath.open("w", newline="", encoding="utf-8", buffering=1<<20) as f:
+            # Plain tuple rows skip the per-row dict build and field-order
+            # re-mapping that DictWriter does, and writerows keeps the
+            # iteration inside the C csv module.
+            writer = csv.writer(f)
+            writer.writerow(_FIELDNAMES)
+            path_cache: dict[Path, str] = {}
+            writer.writerows(self._dependency_row(dep, path_cache) for dep in deps)
 
     def write_json(
             self,
             dependencies: Iterable[DependencyRecord],
-            output_dir: Path | None = None
+            output_dir: Path | None = None,
+            *,
+            presorted: bool = False
     ) -> None:
         """Write the given dependencies to a JSON file named 'sbom.json'.
 
@@ -80,13 +123,22 @@ class SBOMWriter:
         Args:
             dependencies (Iterable[DependencyRecord]): Dependencies to write.
             output_dir (Path | None): Optional directory to override the default.
+            presorted (bool): Skip sorting if the caller already sorted by name.
         """
         filepath = self._resolve_filepath("sbom.json", output_dir)
         logger.info(f"Writing JSON SBOM to {filepath}")
 
-        data = [self._serialize_dependency(dep) for dep in sorted(dependencies, key=lambda d: d.name)]
-        with filepath.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        deps = dependencies if presorted else sorted(dependencies, key=attrgetter("name"))
+        path_cache: dict[Path, str] = {}
+        # dict(zip(...)) pairs the field names with the row entirely in C.
+        data = [dict(zip(_FIELDNAMES, self._dependency_row(dep, path_cache))) for dep in deps]
+        if orjson is not None:
+            # orjson returns ready-to-write bytes, skipping the chunked
+            # Python-level encoder that json.dump uses (slowest with indent).
+            filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with filepath.open("w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
         
 
 
@@ -101,5 +153,8 @@ class SBOMWriter:
             dependencies (Iterable[DependencyRecord]): Dependencies to write.
             output_dir (Path | None): Optional directory to override the default.
         """
-        self.write_csv(dependencies, output_dir)
-        self.write_json(dependencies, output_dir)
\ No newline at end of file
+        # Sort once here instead of once per output format.
+        # attrgetter is a C function, faster than a Python lambda as sort key.
+        deps_sorted = sorted(dependencies, key=attrgetter("name"))
+        self.write_csv(deps_sorted, output_dir, presorted=True)
+        self.write_json(deps_sorted, output_dir, presorted=True)
\ No newline at end of file
@@ -1,55 +1,83 @@
-import subprocess
+import logging
 import tempfile
 import unittest
-from unittest.mock import patch
 from pathlib import Path
-from contextlib import contextmanager
-from typing import TypeAlias, Union, Iterator
+from typing import TypeAlias, Union
 
 from sbom.models import DependencyRecord
 from sbom.scanner import DependencyScanner, NoDependenciesFoundError
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 FileStructure: TypeAlias = dict[str, Union[str, "FileStructure"]]
 
 class TestDependencyScanner(unittest.TestCase):
-    def setUp(self):
-        # This turns off warning logging, because otherwise,
-        # a warning about missing git commit will be logged for every test.
-        patcher = patch("sbom.scanner.logger.warning")
-        self.mock_logger = patcher.start()
-        self.addCleanup(patcher.stop)
-
-    @contextmanager
-    def _create_temp_fs(self, structure: FileStructure) -> Iterator[Path]:
+    @classmethod
+    def setUpClass(cls):
+        # One TemporaryDirectory for the whole class; each _create_temp_fs
+        # call gets its own subdirectory inside it. This avoids a full
+        # mkdtemp/rmtree cycle per test.
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls._tmp_root = Path(cls._tmp.name)
+
+        # Raise the scanner logger level once instead of mock-patching
+        # logger.warning in every test; otherwise a warning about the
+        # missing git commit would be logged for every test.
+        cls._scanner_logger = logging.getLogger("sbom.scanner")
+        cls._old_log_level = cls._scanner_logger.level
+        cls._scanner_logger.setLevel(logging.ERROR)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._scanner_logger.setLevel(cls._old_log_level)
+        cls._tmp.cleanup()
+
+    def _create_temp_fs(self, structure: FileStructure) -> Path:
         """Create a temporary file/folder structure for testing.
 
+        The structure lives in a fresh subdirectory of the class-level
+        temporary directory and is cleaned up with it in tearDownClass.
+
         Args:
             structure (FileStructure): Nested dict representing files/folders.
 
-        Yields:
-            Path: Path to the root temporary directory.
+        Returns:
+            Path: Path to the root of the created structure.
         """
-        with tempfile.TemporaryDirectory() as root_dir:
-            root = Path(root_dir)
-
-            def _create(current_path: Path, struct: FileStructure):
-                for name, value in struct.items():
-                    path = current_path / name
-                    if isinstance(value, dict):
-                        path.mkdir(parents=True, exist_ok=True)
-                        _create(path, value)
-                    else:
-                        path.write_text(value)
-            
-            _create(root, structure)
-            yield root
+        root = Path(tempfile.mkdtemp(dir=self._tmp_root))
+
+        # Flatten the nested dict first, then create all directories in
+        # one batch (shallowest first, so parents always exist) and write
+        # the files; avoids redundant exist_ok stat calls per level.
+        files: list[tuple[Path, str]] = []
+        directories: set[Path] = set()
+        stack: list[tuple[Path, FileStructure]] = [(root, structure)]
+        while stack:
+            current_path, struct = stack.pop()
+            for name, value in struct.items():
+                path = current_path / name
+                if isinstance(value, dict):
+                    directories.add(path)
+                    stack.append((path, value))
+                else:
+                    files.append((path, value))
+
+        for directory in sorted(directories, key=lambda p: len(p.parts)):
+            directory.mkdir()
+        for path, content in files:
+            path.write_text(content)
+
+        return root
         
     def _get_dependencies_from_structure(self, structure: FileStructure) -> list[DependencyRecord]:
         """Helper that builds a temp FS and returns sorted dependencies."""
-        with self._create_temp_fs(structure) as tmp:
-            scanner = DependencyScanner(tmp)
-            deps = scanner.get_dependencies()
-            return sorted(deps, key=lambda d: d.name)      
+        tmp = self._create_temp_fs(structure)
+        scanner = DependencyScanner(tmp)
+        deps = scanner.get_dependencies()
+        return sorted(deps, key=lambda d: d.name)      
 
     def test_reads_single_line_requirements(self):
         """Scanner correctly reads a single dependency from requirements.txt."""        
@@ -78,6 +106,16 @@ class TestDependencyScanner(unittest.TestCase):
             elif dep.name == "requests":
                 self.assertEqual(dep.version, "==3.23.1")
 
+    def test_reads_requirements_with_extras(self):
+        """A name with an extras group keeps its version spec."""
+        deps = self._get_dependencies_from_structure({
+            "repo1": {"requirements.txt": "requests[security]==2.1.0"}
+        })
+
+        self.assertEqual(len(deps), 1)
+        self.assertEqual(deps[0].name, "requests[security]")
+        self.assertEqual(deps[0].version, "==2.1.0")
+
     def test_ignores_commented_lines(self):
         """Lines starting with # are ignored."""
         deps = self._get_dependencies_from_structure({
@@ -210,6 +248,100 @@ class TestDependencyScanner(unittest.TestCase):
                 self.assertEqual(dep.version, "4.12.1")
                 self.assertFalse(dep.dev)
     
+    def test_reads_package_lock_2(self):
+        """Scanner reads a lockfileVersion 2 file from its flat packages map.
+
+        v2 lockfiles repeat the install in the legacy nested "dependencies"
+        tree; only the "packages" map should be parsed, deriving names from
+        the node_modules/ keys and skipping the root entry.
+        """
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                "package-lock.json": """{
+                    "name": "test-package",
+                    "version": "1.0.0",
+                    "lockfileVersion": 2,
+                    "requires": true,
+                    "packages": {
+                        "": {
+                            "name": "test-package",
+                            "version": "1.0.0"
+                        },
+                        "node_modules/some-dep": {
+                            "version": "6.1.0"
+                        },
+                        "node_modules/a-dev-dep": {
+                            "version": "2.3.4",
+                            "dev": true
+                        }
+                    },
+                    "dependencies": {
+                        "some-dep": {
+                            "version": "6.1.0"
+                        },
+                        "a-dev-dep": {
+                            "version": "2.3.4",
+                            "dev": true
+                        }
+                    }
+                }"""
+            }
+        })
+
+        dep_names = {d.name for d in deps}
+        self.assertEqual(dep_names, {"some-dep", "a-dev-dep"})
+        self.assertEqual(len(deps), 2) # the legacy tree must not add duplicates
+
+        for dep in deps:
+            if dep.name == "some-dep":
+                self.assertEqual(dep.version, "6.1.0")
+                self.assertFalse(dep.dev)
+            elif dep.name == "a-dev-dep":
+                self.assertEqual(dep.version, "2.3.4")
+                self.assertTrue(dep.dev)
+
+    @unittest.skipIf(ijson is None, "ijson is not installed")
+    def test_stream_package_lock_packages_matches_full_parse(self):
+        """The ijson streaming parser yields the same records as the full parse."""
+        root = self._create_temp_fs({
+            "repo1": {
+                "package-lock.json": """{
+                    "name": "test-package",
+                    "version": "1.0.0",
+                    "lockfileVersion": 3,
+                    "requires": true,
+                    "packages": {
+                        "": {
+                            "name": "test-package",
+                            "version": "1.0.0"
+                        },
+                        "node_modules/some-or-other-dep": {
+                            "version": "1.2.3"
+                        },
+                        "node_modules/some-or-other-dep/node_modules/recursive-dep": {
+                            "version": "0.9.21"
+                        },
+                        "node_modules/a-dev-dep": {
+                            "version": "2.3.4",
+                            "dev": true
+                        }
+                    }
+                }"""
+            }
+        })
+        lockfile = root / "repo1" / "package-lock.json"
+        scanner = DependencyScanner(root)
+
+        streamed = scanner._stream_package_lock_packages(lockfile, git_commit="abc123")
+
+        self.assertIsNotNone(streamed)
+        dep_names = {d.name for d in streamed}
+        self.assertEqual(dep_names, {"some-or-other-dep", "recursive-dep", "a-dev-dep"})
+
+        # Streaming and full parse must be interchangeable.
+        full = scanner._parse_package_lock_json(lockfile, git_commit="abc123")
+        self.assertEqual(streamed, full)
+
     def test_reads_package_lock_3(self):
         """Scanner reads dependencies from a package-lock.json file with lockfileVersion 3."""
         deps = self._get_dependencies_from_structure({
@@ -262,24 +394,106 @@ class TestDependencyScanner(unittest.TestCase):
                 self.assertEqual(dep.version, "2.3.4")
                 self.assertTrue(dep.dev)
 
-    def test_get_git_commit_mocked(self):
-        """Returns a fake commit hash using a mock."""
-        tmp = Path("/fake/repo")  # any path works, doesn’t have to exist
-        scanner = DependencyScanner(tmp)
+    def test_unsupported_version_in_large_lockfile_falls_back(self):
+        """An oversized lockfile with an unsupported version still falls back to package.json.
 
-        # make subprocess.check_output output a predetermined string
-        fake_output = b"abcdef1234567890abcdef1234567890abcdef12\n"
-        with patch("subprocess.check_output", return_value=fake_output) as mock_sub:
-            commit = scanner._get_git_commit(tmp)
-            mock_sub.assert_called_once_with(
-                ["git", "-C", tmp, "log", "--format=%H", "-n", "1"],
-                stderr=subprocess.STDOUT
-            )
-
-            deps = self._get_dependencies_from_structure({
-                "repo1": {"requirements.txt": "flask"}
-            })
-            dep = next(iter(deps))
+        Large files take the streaming path when ijson is installed, which
+        must preserve the ValueError contract for unsupported versions.
+        """
+        padding = "x" * (1 << 20) # push the file over the streaming threshold
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                "package-lock.json": f'{{"lockfileVersion": 99, "packages": {{"node_modules/ignored": {{"version": "1.0.0"}}}}, "pad": "{padding}"}}',
+                "package.json": """{
+                    "name": "myproject",
+                    "version": "1.0.0",
+                    "dependencies": {
+                        "fallback-dep": "1.0.0"
+                    }
+                }"""
+            }
+        })
+
+        self.assertEqual(len(deps), 1)
+        self.assertEqual(deps[0].name, "fallback-dep")
+
+    def test_malformed_large_lockfile_falls_back(self):
+        """An oversized truncated lockfile still falls back to package.json.
+
+        ijson's parse errors are not ValueError subclasses, so the streaming
+        path must not let them escape the ValueError contract that the
+        package.json fallback relies on.
+        """
+        padding = "x" * (1 << 20) # push the file over the streaming threshold
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                # cut off mid-"packages"; the padding sits before it so the
+                # failure hits the streaming packages pass, not the probe
+                "package-lock.json": f'{{"lockfileVersion": 2, "pad": "{padding}", "packages": {{"node_modules/ignored": {{"version": "1.0.0"',
+                "package.json": """{
+                    "name": "myproject",
+                    "version": "1.0.0",
+                    "dependencies": {
+                        "fallback-dep": "1.0.0"
+                    }
+                }"""
+            }
+        })
+
+        self.assertEqual(len(deps), 1)
+        self.assertEqual(deps[0].name, "fallback-dep")
+
+    def test_get_git_commit_from_head(self):
+        """Resolves the commit hash by following .git/HEAD to the branch ref file."""
+        fake_hash = "abcdef1234567890abcdef1234567890abcdef12"
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                "requirements.txt": "flask",
+                ".git": {
+                    "HEAD": "ref: refs/heads/main\n",
+                    "refs": {"heads": {"main": fake_hash + "\n"}}
+                }
+            }
+        })
+
+        self.assertEqual(deps[0].git_commit, fake_hash)
+
+    def test_get_git_commit_detached_head(self):
+        """A detached HEAD stores the commit hash directly in .git/HEAD."""
+        fake_hash = "1234567890abcdef1234567890abcdef12345678"
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                "requirements.txt": "flask",
+                ".git": {"HEAD": fake_hash + "\n"}
+            }
+        })
+
+        self.assertEqual(deps[0].git_commit, fake_hash)
+
+    def test_get_git_commit_gitdir_pointer_file(self):
+        """Submodule/worktree checkouts where .git is a pointer file don't break the scan."""
+        fake_hash = "deadbeefdeadbeefdeadbeefdeadbeefdeadbeef"
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                "requirements.txt": "flask",
+                ".git": "gitdir: ../gitstore\n"
+            },
+            "gitstore": {"HEAD": fake_hash + "\n"}
+        })
+
+        self.assertEqual(deps[0].git_commit, fake_hash)
+
+    def test_get_git_commit_packed_refs(self):
+        """Falls back to .git/packed-refs when the loose ref file is missing."""
+        fake_hash = "fedcba0987654321fedcba0987654321fedcba09"
+        deps = self._get_dependencies_from_structure({
+            "repo1": {
+                "requirements.txt": "flask",
+                ".git": {
+                    "HEAD": "ref: refs/heads/main\n",
+                    "packed-refs": f"# pack-refs with: peeled fully-peeled sorted\n{fake_hash} refs/heads/main\n"
+                }
+            }
+        })
 
-        self.assertEqual(dep.git_commit, "abcdef1234567890abcdef1234567890abcdef12")
-        self.assertEqual(commit, "abcdef1234567890abcdef1234567890abcdef12")
\ No newline at end of file
+        self.assertEqual(deps[0].git_commit, fake_hash)
\ No newline at end of file